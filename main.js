@@ -1694,6 +1694,7 @@ document.addEventListener('DOMContentLoaded', function () {
   const searchPopup = document.getElementById('search-popup');
   const searchDialectRadios = document.querySelectorAll('#search-popup input[name="dialect"]');
   const searchModeRadios = document.querySelectorAll('#search-popup input[name="search-mode"]');
+  const searchTypoToleranceSelect = document.getElementById('search-typo-tolerance');
 
     // --- 統一獲取常用元素 ---
   const progressDropdown = document.getElementById('progressDropdown');
@@ -2090,6 +2091,22 @@ document.addEventListener('DOMContentLoaded', function () {
     });
   });
 
+  // --- 新增：拼音容錯設定，存到 localStorage ---
+  if (searchTypoToleranceSelect) {
+    const lastTypoTolerance = localStorage.getItem('searchTypoTolerance');
+    if (lastTypoTolerance !== null && searchTypoToleranceSelect.querySelector(`option[value="${lastTypoTolerance}"]`)) {
+      searchTypoToleranceSelect.value = lastTypoTolerance;
+    }
+    searchTypoToleranceSelect.addEventListener('change', function() {
+      localStorage.setItem('searchTypoTolerance', this.value);
+    });
+  }
+
+  function getSearchTypoTolerance() {
+    if (!searchTypoToleranceSelect) return 0;
+    return parseInt(searchTypoToleranceSelect.value, 10) || 0;
+  }
+
   // --- 新增：正規化客語拼音 (拿掉聲調) ---
   // 修改後个 normalizePhonetics 函式
   function normalizePhonetics(text) {
@@ -2256,6 +2273,23 @@ document.addEventListener('DOMContentLoaded', function () {
                 return null;
             }).filter(Boolean);
         }
+
+        // --- 新增：拼音容錯比對 ---
+        // 音節拼毋著 (如 san/sang) 或用別種拼音系統 (如 tsii/zii) 也尋得著；
+        // 上背已經尋著个詞條毋再加，容錯尋著个結果排在後背，照距離排 (毋比聲調)
+        const sourceNames = dialectData.filter(level => level && level.content).map(level => level.name);
+        if (gipDialectData && gipDialectData.content) sourceNames.push(gipDialectData.name);
+        const typoMatcher = createPhoneticTypoMatcher(keyword, sourceNames, combinedData, getSearchTypoTolerance());
+        if (typoMatcher) {
+            const matchedKeys = new Set(results.map(item => `${item.sourceName || ''}|${item.編號}`));
+            const typoResults = combinedData.map(item => {
+                if (matchedKeys.has(`${item.sourceName || ''}|${item.編號}`)) return null;
+                const phoneticDistance = typoMatcher(item['客語標音_查詢']);
+                if (phoneticDistance === -1) return null;
+                return { ...item, _match: { inPhonetics: true, isExact: false, isTypo: true, phoneticDistance } };
+            }).filter(Boolean);
+            results = results.concat(typoResults);
+        }
     } else if (searchMode === '華語') { // For 華語詞義 and 翻譯
         const lowerKeyword = keyword.toLowerCase();
         results = combinedData.map(item => {
@@ -2284,11 +2318,21 @@ document.addEventListener('DOMContentLoaded', function () {
         return 4; // 預防萬一
     };
     results.sort((a, b) => {
+        // 拼音容錯尋著个結果排在正經尋著个後背
+        const typoA = a._match.isTypo ? 1 : 0;
+        const typoB = b._match.isTypo ? 1 : 0;
+        if (typoA !== typoB) return typoA - typoB;
         const rankA = getCategoryRank(a, searchMode);
         const rankB = getCategoryRank(b, searchMode);
         if (rankA !== rankB) {
             return rankA - rankB;
         }
+        // 拼音容錯尋著个結果照編輯距離排
+        if (searchMode === '客家語') {
+            const distanceA = a._match.phoneticDistance || 0;
+            const distanceB = b._match.phoneticDistance || 0;
+            if (distanceA !== distanceB) return distanceA - distanceB;
+        }
         // Roo: 若排序級別相同，保持原有順序或加入次要排序規則 (暫時穩定即可)
         return 0;
     });
@@ -2644,6 +2688,7 @@ document.addEventListener('DOMContentLoaded', function () {
 
   searchDialectRadios.forEach(radio => radio.addEventListener('change', triggerSearchOnChange));
   searchModeRadios.forEach(radio => radio.addEventListener('change', triggerSearchOnChange));
+  if (searchTypoToleranceSelect) searchTypoToleranceSelect.addEventListener('change', triggerSearchOnChange);
 
 
   // --- 檢查 URL 協定 ---
@@ -2894,6 +2939,7 @@ document.addEventListener('DOMContentLoaded', function () {
 
   // --- 新增：設定選詞 Popup 功能 ---
   if (selectionPopup && selectionPopupBackdrop && selectionPopupContent && selectionPopupCloseBtn && contentContainer) { // *** MODIFIED: Use contentContainer ***
+    scheduleConcordanceLoad(); // 趁閒先載入跨腔調對照索引，選詞查讀音个時節就毋使掃過逐隻資料表
     if (isMobileDevice()) {
       console.log('手機裝置，設定 selectionchange 監聽器分查詞按鈕。');
       createMobileLookupButton(selectionPopup, selectionPopupContent, selectionPopupBackdrop);
@@ -3923,99 +3969,179 @@ function isFirefox() {
   return navigator.userAgent.toLowerCase().includes('firefox');
 }
 
+// --- 版面調整批次處理：ruby 字體同 #header 溢出，逐隻 animation frame 最多做一擺 ---
+// 先統一寫 (重設行內字體)、再統一量、最尾再統一寫，恁樣一擺調整淨會觸發一擺 layout。
+const rubyFitPending = new Set(); // 下一擺 layout pass 愛調整个 ruby 元素
+const rubyFitDirty = new WeakSet(); // 版面變過、還吂調整个 ruby 元素
+const rubyFitVisible = new Set(); // 目前在畫面內 (含緩衝範圍) 个 ruby 元素
+const rubyFitObserved = new Set(); // 已經交分 IntersectionObserver 監聽个 ruby 元素
+let rubyVisibilityObserver = null;
+let headerFitPending = false;
+let layoutFitFrameId = null;
+
 /**
- * 調整單一 ruby 元素个字體大小，避免在 Firefox 中溢出。
- * @param {HTMLElement} rubyElement - 要調整个 ruby 元素。
+ * 排定下一隻 animation frame 執行 layout pass，共一隻 frame 裡肚重複呼叫淨會做一擺。
  */
-function adjustRubyFontSize(rubyElement) {
-  if (!isFirefox()) return; // 只在 Firefox 執行
+function scheduleLayoutFit() {
+  if (layoutFitFrameId !== null) return;
+  layoutFitFrameId = requestAnimationFrame(runLayoutFitPass);
+}
 
-  const tdElement = rubyElement.closest('td');
-  if (!tdElement) return;
-
-  // 先重設字體大小，以便取得正確个 scrollWidth
-  rubyElement.style.fontSize = ''; // 重設為 CSS 預設值
-  // 需要強制瀏覽器重新計算樣式
-      const forcedStyle = window.getComputedStyle(rubyElement); // 強制重新計算並取得樣式
-      const currentFontSize = parseFloat(forcedStyle.fontSize); // 取得重設後个字體大小
-      const rubyWidth = rubyElement.scrollWidth; // 取得重設後个捲動闊度
-
-    // --- 新增：判斷模式並計算可用寬度 ---
-        const computedTdStyle = window.getComputedStyle(tdElement); // td 樣式
-    const isCardMode = computedTdStyle.display === 'block';
-    let availableWidth;
-    const buffer = 5; // 緩衝空間
-
-    if (isCardMode) {
-      // 卡片模式：clientWidth 減去 paddingLeft (像素) 再減 buffer
-      const paddingLeftPx = parseFloat(computedTdStyle.paddingLeft);
-      // 考慮到 ::before 佔用个空間，再減去 buffer
-      availableWidth = tdElement.clientWidth - paddingLeftPx - buffer * 3; // 稍微多減一點 buffer
-      // console.log(`Card Mode: clientW=${tdElement.clientWidth}, padL=${paddingLeftPx}, availW=${availableWidth}`);
-    } else {
-      // 寬螢幕模式：直接用 clientWidth 減 buffer
-      availableWidth = tdElement.clientWidth - buffer;
-      // console.log(`Wide Mode: clientW=${tdElement.clientWidth}, availW=${availableWidth}`);
-    }
-    // --- 新增結束 ---
-    
-    if (rubyWidth > availableWidth) {
-      // <-- 用 availableWidth 比較
-          // 按比例計算新字體大小，但設定下限 (用 Math.floor 避免小數造成循環)
-      let newSize = Math.floor((currentFontSize * availableWidth) / rubyWidth);
-      const minSize = 10; // 最小字體大小 (px)
-      newSize = Math.max(newSize, minSize);
-
-      if (newSize < currentFontSize) {
-        // 只有在需要縮小時才應用
-        // console.log(`Firefox: Adjusting ruby font size: ${rubyElement.textContent.substring(0,10)}... from ${currentFontSize}px to ${newSize}px`);
-            // 檢查係無係同目前設定个 style.fontSize 無共樣，避免重複設定
-            if (rubyElement.style.fontSize !== `${newSize}px`) {
-              rubyElement.style.fontSize = `${newSize}px`;
-            }
+/**
+ * 取得監聽 ruby 元素有無在畫面內个 IntersectionObserver。
+ * 畫面外个 ruby 淨標記做 dirty，捲入畫面个時節正調整。
+ * @returns {IntersectionObserver|null} 瀏覽器毋支援就回傳 null。
+ */
+function getRubyVisibilityObserver() {
+  if (rubyVisibilityObserver || !window.IntersectionObserver) return rubyVisibilityObserver;
+  rubyVisibilityObserver = new IntersectionObserver((entries) => {
+    let hasDetached = false;
+    entries.forEach((entry) => {
+      const rubyElement = entry.target;
+      if (!rubyElement.isConnected) {
+        hasDetached = true; // #generated 重建了，舊表格个 ruby 已經拿忒
+      } else if (entry.isIntersecting) {
+        rubyFitVisible.add(rubyElement);
+        if (rubyFitDirty.has(rubyElement)) rubyFitPending.add(rubyElement);
       } else {
-        // 如果計算出个 newSize 無比 currentFontSize 細，愛確定拿忒 style.fontSize
-            // 這表示預設字體較好，或者已經在最小值但還係溢出。
-            // 若先前有縮小過 (style.fontSize 有值)，就重設佢。
-            if (rubyElement.style.fontSize) {
-          // console.log(`Firefox: Ruby fits or newSize >= currentSize, removing inline style.`);
-          rubyElement.style.fontSize = '';
-        }
-      }
-    } else {
-      // 如果 ruby 元素闊度細過可用闊度，愛確定拿忒 style.fontSize
-          if (rubyElement.style.fontSize) { // 若先前有設定 style.fontSize，就清掉
-        // console.log(`Firefox: Ruby fits, removing inline style.`);
-        rubyElement.style.fontSize = '';
+        rubyFitVisible.delete(rubyElement);
       }
+    });
+    if (hasDetached) releaseDetachedRubies();
+    if (rubyFitPending.size > 0) scheduleLayoutFit();
+  }, { rootMargin: '200px 0px' }); // 頭尾多留 200px，捲動時較毋會看著還吂調整个字
+  return rubyVisibilityObserver;
+}
+
+/**
+ * 舊表格个 ruby 已經毋在 DOM 裡肚，停止監聽並從暫存拿忒。
+ */
+function releaseDetachedRubies() {
+  rubyFitObserved.forEach((rubyElement) => {
+    if (!rubyElement.isConnected) {
+      if (rubyVisibilityObserver) rubyVisibilityObserver.unobserve(rubyElement);
+      rubyFitObserved.delete(rubyElement);
+      rubyFitVisible.delete(rubyElement);
+      rubyFitPending.delete(rubyElement);
     }
-      // 同步套用，拿掉 setTimeout(0)
+  });
+}
+
+/**
+ * 量 ruby 元素同佢所在个 td，算出愛縮細到幾多字體大細 (只讀毋寫)。
+ * 呼叫前 ruby 个 style.fontSize 愛先重設。
+ * @param {HTMLElement} rubyElement - 要調整个 ruby 元素。
+ * @returns {number|null} 新个字體大細 (px)；毋使縮細就回傳 null。
+ */
+function measureRubyFontFit(rubyElement) {
+  const tdElement = rubyElement.closest('td');
+  if (!tdElement) return null;
+
+  const currentFontSize = parseFloat(window.getComputedStyle(rubyElement).fontSize); // 重設後个字體大小
+  const rubyWidth = rubyElement.scrollWidth; // 重設後个捲動闊度
+
+  // --- 判斷模式並計算可用寬度 ---
+  const computedTdStyle = window.getComputedStyle(tdElement); // td 樣式
+  const isCardMode = computedTdStyle.display === 'block';
+  const buffer = 5; // 緩衝空間
+  let availableWidth;
+  if (isCardMode) {
+    // 卡片模式：clientWidth 減去 paddingLeft，考慮到 ::before 佔用个空間，再稍微多減一點 buffer
+    availableWidth = tdElement.clientWidth - parseFloat(computedTdStyle.paddingLeft) - buffer * 3;
+  } else {
+    // 寬螢幕模式：直接用 clientWidth 減 buffer
+    availableWidth = tdElement.clientWidth - buffer;
+  }
+
+  if (rubyWidth <= availableWidth) return null;
+
+  // 按比例計算新字體大小，但設定下限 (用 Math.floor 避免小數造成循環)
+  const minSize = 10; // 最小字體大小 (px)
+  const newSize = Math.max(Math.floor((currentFontSize * availableWidth) / rubyWidth), minSize);
+  // 只有在需要縮小時才應用
+  return newSize < currentFontSize ? newSize : null;
+}
+
+/**
+ * 一擺 animation frame 个 layout pass：
+ * 1. 寫：重設排定个 ruby 同 #header 元素个行內字體大細
+ * 2. 讀：一擺 layout 量出全部需要个尺寸
+ * 3. 寫：套用新个字體大細
+ */
+function runLayoutFitPass() {
+  layoutFitFrameId = null;
+
+  const rubyElements = [...rubyFitPending].filter((rubyElement) => rubyElement.isConnected);
+  rubyFitPending.clear();
+  const headerFit = headerFitPending ? getHeaderFontFitTargets() : null;
+  headerFitPending = false;
+
+  // 1. 寫
+  rubyElements.forEach((rubyElement) => {
+    rubyElement.style.fontSize = '';
+  });
+  if (headerFit) resetHeaderFontSizes(headerFit);
+
+  // 2. 讀
+  const rubyFontSizes = rubyElements.map(measureRubyFontFit);
+  if (headerFit) measureHeaderFontFit(headerFit);
+
+  // 3. 寫
+  rubyElements.forEach((rubyElement, i) => {
+    if (rubyFontSizes[i] !== null) rubyElement.style.fontSize = `${rubyFontSizes[i]}px`;
+    rubyFitDirty.delete(rubyElement);
+  });
+  if (headerFit) applyHeaderFontFit(headerFit);
+
+  if (rubyElements.length > 0) {
+    console.log(`Firefox: Adjusted ruby font sizes for ${rubyElements.length} visible element(s) in one layout pass.`);
+  }
 }
 
 /**
  * 調整指定容器內所有相關 ruby 元素个字體大小。
+ * 所有 ruby 先標記做 dirty，淨有在畫面內个會排入下一擺 layout pass，其他个等捲入畫面正調整。
  * @param {HTMLElement} containerElement - 包含表格个容器元素。
  */
 function adjustAllRubyFontSizes(containerElement) {
   if (!isFirefox()) return;
-  console.log('Firefox: Adjusting ruby font sizes...');
   // 只針對包含客家語个 td 裡背个 ruby 做調整
   const rubyElements = containerElement.querySelectorAll(
     'td[data-label="詞彙"] ruby'
   );
+  const observer = getRubyVisibilityObserver();
+  releaseDetachedRubies();
+
   rubyElements.forEach((rubyElement) => {
-    // 在調整前先重設，確保 resize 時能從原始大小開始計算
-    rubyElement.style.fontSize = '';
-    adjustRubyFontSize(rubyElement);
+    rubyFitDirty.add(rubyElement);
+    if (!observer) {
+      rubyFitPending.add(rubyElement); // 毋支援 IntersectionObserver，就全部調整
+    } else if (!rubyFitObserved.has(rubyElement)) {
+      rubyFitObserved.add(rubyElement);
+      observer.observe(rubyElement); // 新个 ruby：observer 第一擺 callback 會決定愛無愛調整
+    } else if (rubyFitVisible.has(rubyElement)) {
+      rubyFitPending.add(rubyElement);
+    }
   });
+
+  if (rubyFitPending.size > 0) scheduleLayoutFit();
 }
 
 /**
  * 動態調整 #header 內主要元素 (#progressDropdown, #progressDetails) 的字體大小，
  * 檢查 #header 是否發生橫向溢出 (overflow)，如果是，則縮小字體。
+ * 實際个調整會排入下一擺 layout pass，同 ruby 字體調整共下做。
  */
 function adjustHeaderFontSizeOnOverflow() {
-    console.log('--- adjustHeaderFontSizeOnOverflow function CALLED ---');
+    headerFitPending = true;
+    scheduleLayoutFit();
+}
+
+/**
+ * 取得 #header 裡肚愛調整字體大細个元素。
+ * @returns {object|null} layout pass 用个狀態物件；缺少必要元素就回傳 null。
+ */
+function getHeaderFontFitTargets() {
     const header = document.getElementById('header');
     const dropdown = document.getElementById('progressDropdown');
     const detailsContainer = document.getElementById('progressDetails');
@@ -4024,7 +4150,7 @@ function adjustHeaderFontSizeOnOverflow() {
     // --- MODIFIED: Check for essential container elements first ---
     if (!header || !dropdown || !detailsContainer) {
         console.warn('adjustHeaderFontSizeOnOverflow: Missing essential elements (header, dropdown, or detailsContainer). Skipping execution.');
-        return;
+        return null;
     }
 
     const linkElement = detailsContainer.querySelector('a'); // May be null
@@ -4037,96 +4163,84 @@ function adjustHeaderFontSizeOnOverflow() {
     if (searchInput) {
         elementsToResize.push({ element: searchInput, minSize: 12 });
     }
+    return { header, linkElement, elementsToResize, headerWidth: 0, totalRequiredWidth: 0 };
+}
 
-    // --- 記錄目標元素的初始字體大小 ---
-    const initialStyles = elementsToResize.map(item => ({
-        element: item.element,
-        initialSize: parseFloat(window.getComputedStyle(item.element).fontSize),
-        minSize: item.minSize
-    }));
-
-    // --- 重設行內樣式，以便計算自然寬度 ---
-    initialStyles.forEach(item => {
+/**
+ * layout pass 第 1 步 (寫)：重設行內樣式，以便計算自然寬度。
+ */
+function resetHeaderFontSizes(headerFit) {
+    headerFit.elementsToResize.forEach(item => {
         item.element.style.fontSize = '';
     });
-    if (linkElement) {
-        linkElement.style.whiteSpace = ''; // Also reset whitespace
+    if (headerFit.linkElement) {
+        headerFit.linkElement.style.whiteSpace = ''; // Also reset whitespace
     }
-    
-    // 強制瀏覽器重繪
-    header.offsetHeight;
-
-    // --- 計算 Header 可用寬度與初始需求寬度 ---
-    const headerWidth = header.clientWidth;
-    let totalRequiredWidth = calculateTotalRequiredWidth(header);
+}
 
-    console.log(`Header Width: ${headerWidth}, Initial Required Width: ${totalRequiredWidth}`);
+/**
+ * layout pass 第 2 步 (讀)：記錄自然字體大細、Header 可用寬度與需求寬度。
+ */
+function measureHeaderFontFit(headerFit) {
+    headerFit.elementsToResize.forEach(item => {
+        item.initialSize = parseFloat(window.getComputedStyle(item.element).fontSize);
+    });
+    headerFit.headerWidth = headerFit.header.clientWidth;
+    headerFit.totalRequiredWidth = calculateTotalRequiredWidth(headerFit.header);
+}
 
-    // --- 檢查是否溢出 ---
-    const isOverflowing = totalRequiredWidth > headerWidth;
+/**
+ * layout pass 第 3 步 (寫)：溢出个時節，先照比例一擺縮細字體；
+ * 因為 gap、padding 毋會跟等縮，還係溢出正逐 px 縮 (這時節正會有額外个 layout)。
+ */
+function applyHeaderFontFit(headerFit) {
+    const { header, linkElement, elementsToResize, headerWidth } = headerFit;
+    let totalRequiredWidth = headerFit.totalRequiredWidth;
     const buffer = 1; // 允許一點點誤差
 
-    if (isOverflowing && totalRequiredWidth - headerWidth > buffer) {
-        console.log(`#header is overflowing by ${totalRequiredWidth - headerWidth}px. Shrinking fonts.`);
-        
-        if (linkElement) {
-            linkElement.style.whiteSpace = 'nowrap';
-        }
+    if (totalRequiredWidth - headerWidth <= buffer) return; // 未溢出，第 1 步已經重設好了
 
-        // --- 逐步縮小字體 ---
-        let canShrinkMore = true;
-        for (let i = 0; i < 50 && totalRequiredWidth > headerWidth && canShrinkMore; i++) {
-            canShrinkMore = false;
-            let currentTotalWidthBeforeShrink = totalRequiredWidth;
-
-            initialStyles.forEach(item => {
-                let currentElementSize = parseFloat(item.element.style.fontSize || item.initialSize);
-                if (currentElementSize > item.minSize) {
-                    currentElementSize -= 1;
-                    item.element.style.fontSize = `${currentElementSize}px`;
-                    canShrinkMore = true;
-                } else {
-                    item.element.style.fontSize = `${item.minSize}px`;
-                }
-            });
+    console.log(`#header is overflowing by ${totalRequiredWidth - headerWidth}px. Shrinking fonts.`);
+    if (linkElement) {
+        linkElement.style.whiteSpace = 'nowrap';
+    }
 
-            if (!canShrinkMore) {
-                 console.log('All elements reached minimum font size.');
-                 break;
+    // --- 照比例估算字體大小 ---
+    const scale = headerWidth / totalRequiredWidth;
+    elementsToResize.forEach(item => {
+        item.element.style.fontSize = `${Math.max(Math.floor(item.initialSize * scale), item.minSize)}px`;
+    });
+    totalRequiredWidth = calculateTotalRequiredWidth(header);
+
+    // --- 還係溢出，逐步縮小字體 ---
+    for (let i = 0; i < 50 && totalRequiredWidth > headerWidth; i++) {
+        const currentTotalWidthBeforeShrink = totalRequiredWidth;
+        let canShrinkMore = false;
+
+        elementsToResize.forEach(item => {
+            const currentElementSize = parseFloat(item.element.style.fontSize);
+            if (currentElementSize > item.minSize) {
+                item.element.style.fontSize = `${currentElementSize - 1}px`;
+                canShrinkMore = true;
             }
+        });
 
-            header.offsetHeight;
-            totalRequiredWidth = calculateTotalRequiredWidth(header);
-            console.log(`  Shrunk step ${i+1}, new required width: ${totalRequiredWidth}`);
-
-            if (totalRequiredWidth >= currentTotalWidthBeforeShrink && canShrinkMore) {
-                console.warn('  Width did not decrease after shrinking, breaking loop to prevent infinite loop.');
-                break;
-            }
+        if (!canShrinkMore) {
+            console.log('All elements reached minimum font size.');
+            break;
         }
 
-        if (totalRequiredWidth > headerWidth) {
-             console.warn(`Fonts shrunk to minimum, but header might still overflow by ${totalRequiredWidth - headerWidth}px.`);
-        } else {
-             console.log(`Font sizes adjusted. Final required width: ${totalRequiredWidth}`);
+        totalRequiredWidth = calculateTotalRequiredWidth(header);
+        if (totalRequiredWidth >= currentTotalWidthBeforeShrink) {
+            console.warn('  Width did not decrease after shrinking, breaking loop to prevent infinite loop.');
+            break;
         }
+    }
 
+    if (totalRequiredWidth > headerWidth) {
+         console.warn(`Fonts shrunk to minimum, but header might still overflow by ${totalRequiredWidth - headerWidth}px.`);
     } else {
-        // --- 未溢出 ---
-        let stylesReset = false;
-        initialStyles.forEach(item => {
-            if (item.element.style.fontSize !== '') {
-                item.element.style.fontSize = '';
-                stylesReset = true;
-            }
-        });
-        if (linkElement && linkElement.style.whiteSpace !== '') {
-             linkElement.style.whiteSpace = '';
-             stylesReset = true;
-        }
-        if (stylesReset) {
-            console.log('Reset font sizes to default.');
-        }
+         console.log(`Font sizes adjusted. Final required width: ${totalRequiredWidth}`);
     }
 }
 
@@ -4215,8 +4329,208 @@ function getFullLevelName(dataVarNameStr) {
   return dialectName + levelName;
 }
 
+/**
+ * 將資料變數名轉換為 popup 顯示用个來源名稱（如 "四基" → "四縣基礎級"，"教典安" → "詔安教典"）。
+ * @param {string} dataVarName - 資料變數名。
+ * @param {string} sourceType - 'cert' 或 'gip'。
+ * @returns {string} 來源名稱。
+ */
+function getPopupSourceName(dataVarName, sourceType) {
+  if (sourceType === 'cert') {
+    return getFullLevelName(dataVarName);
+  }
+  // --- FIX: 修正 gip 資料个來源名稱，確保佢做得被腔調過濾器正確處理 ---
+  const gipNameMap = { '教典四': '四縣教典', '教典海': '海陸教典', '教典大': '大埔教典', '教典平': '饒平教典', '教典安': '詔安教典', '教典南': '南四縣教典' };
+  return gipNameMap[dataVarName] || dataVarName; // 若無對應到，用原名做 fallback
+}
+
+/**
+ * 建立 popup 播放音檔需要个資料 (分 constructAudioUrlForPopup 用)。
+ * @param {object} line - 詞條資料 (愛有 '編號'、'詞目音檔名' 等欄位)。
+ * @param {string} dataVarName - 資料變數名 (例: '四基'、'教典安')。
+ * @param {string} displayName - 來源名稱 (例: '四縣基礎級')。
+ * @returns {object|null} audioDetails 物件。
+ */
+function buildPopupAudioDetails(line, dataVarName, displayName) {
+  // --- FIX: 根據 sourceType，用正確个變數 (dataVarName) 來建立 audioDetails ---
+  if (line.sourceType === 'cert') {
+    // 對 cert 資料，愛用 dataVarName (例: '四基') 來分析腔調級別
+    const 腔 = dataVarName.substring(0, 1);
+    const 級 = dataVarName.substring(1);
+    let selected例外音檔;
+    switch (級) {
+      case '基': selected例外音檔 = typeof 基例外音檔 !== 'undefined' ? 基例外音檔 : []; break;
+      case '初': selected例外音檔 = typeof 初例外音檔 !== 'undefined' ? 初例外音檔 : []; break;
+      case '中': selected例外音檔 = typeof 中例外音檔 !== 'undefined' ? 中例外音檔 : []; break;
+      case '中高': selected例外音檔 = typeof 中高例外音檔 !== 'undefined' ? 中高例外音檔 : []; break;
+      case '高': selected例外音檔 = typeof 高例外音檔 !== 'undefined' ? 高例外音檔 : []; break;
+      default: selected例外音檔 = [];
+    }
+    let 檔腔 = '', 檔級 = '', 目錄級 = '', 目錄另級 = undefined;
+    if (腔 === '四') { 檔腔 = 'si'; } else if (腔 === '海') { 檔腔 = 'ha'; } else if (腔 === '大') { 檔腔 = 'da'; } else if (腔 === '平') { 檔腔 = 'rh'; } else if (腔 === '安') { 檔腔 = 'zh'; }
+    if (級 === '基') { 目錄級 = '5'; 目錄另級 = '1'; } else if (級 === '初') { 目錄級 = '1'; } else if (級 === '中') { 目錄級 = '2'; 檔級 = '1'; } else if (級 === '中高') { 目錄級 = '3'; 檔級 = '2'; } else if (級 === '高') { 目錄級 = '4'; 檔級 = '3'; }
+    return { lineData: { ...line }, dialectInfo: { 腔, 級, selected例外音檔, generalMediaYr: '112', 目錄級, 目錄另級, 檔腔, 檔級, fullLvlName: displayName } };
+  } else if (line.sourceType === 'gip') {
+    return { lineData: { ...line }, dialectInfo: { sourceType: 'gip' } };
+  }
+  return null;
+}
+
+let concordanceLoadState = 'idle'; // 'idle' | 'loading' | 'indexing' | 'loaded' | 'failed'
+const dataRowsByNumberCache = {}; // 資料變數名 → Map(編號 → 詞條)，分對照索引查詳細資料用
+
+/**
+ * 網頁載入後趁閒載入 process_all_data.py 產生个 data/concordance.js (跨腔調詞彙對照索引)。
+ * 檔案無細，所以毋放在 index.html 擋等網頁；用 <script> 載入 (file:// 也做得用)。
+ */
+function scheduleConcordanceLoad() {
+  const runWhenIdle = window.requestIdleCallback || ((callback) => setTimeout(callback, 1000));
+  runWhenIdle(loadConcordanceData);
+}
+
+function loadConcordanceData() {
+  if (concordanceLoadState !== 'idle') return;
+  concordanceLoadState = 'loading';
+  const script = document.createElement('script');
+  script.src = 'data/concordance.js';
+  script.onload = () => {
+    if (typeof concordanceData === 'undefined') {
+      concordanceLoadState = 'failed';
+      return;
+    }
+    concordanceLoadState = 'indexing';
+    buildConcordanceRowMaps(concordanceData.sources);
+  };
+  script.onerror = () => {
+    concordanceLoadState = 'failed';
+    console.warn('尋無 data/concordance.js，選詞查讀音會繼續逐隻資料表掃過。');
+  };
+  document.head.appendChild(script);
+}
+
+/**
+ * 索引載入後，趁閒逐隻資料表建立「編號 → 詞條」个 Map (一擺做一隻，避免卡等畫面)。
+ * 全部建好正切換做 'loaded'，恁樣查讀音个時節淨係查 Map，毋使再解析資料表。
+ * @param {Array<string>} dataVarNames - 索引个 sources (資料變數名)。
+ */
+function buildConcordanceRowMaps(dataVarNames) {
+  const runWhenIdle = window.requestIdleCallback || ((callback) => setTimeout(callback, 0));
+  let nextIndex = 0;
+  const buildNext = () => {
+    if (nextIndex < dataVarNames.length) {
+      getDataRowsByNumber(dataVarNames[nextIndex++]);
+      runWhenIdle(buildNext);
+    } else {
+      concordanceLoadState = 'loaded';
+      console.log(`Concordance index ready (${dataVarNames.length} sources).`);
+    }
+  };
+  runWhenIdle(buildNext);
+}
+
+/**
+ * 取得資料表个「編號 → 詞條」Map，第一擺用著个時節正解析並暫存。
+ * @param {string} dataVarName - 資料變數名 (例: '四基'、'教典安')。
+ * @returns {Map<string, object>} 資料表無載入就回傳空个 Map。
+ */
+function getDataRowsByNumber(dataVarName) {
+  if (!dataRowsByNumberCache[dataVarName]) {
+    let dataObject;
+    try {
+      dataObject = eval(dataVarName);
+    } catch (e) {
+      dataObject = undefined;
+    }
+    const rowsByNumber = new Map();
+    if (dataObject && dataObject.content) {
+      parseUnifiedCsv(dataObject.content).forEach(line => rowsByNumber.set(line.編號, line));
+    }
+    dataRowsByNumberCache[dataVarName] = rowsByNumber;
+  }
+  return dataRowsByNumberCache[dataVarName];
+}
+
+/**
+ * 將華語詞義切做一條一條个釋義，做詞義索引个 key。愛同 process_all_data.py 个 normalize_meaning_keys 共樣。
+ * @param {string} meaningText - 華語詞義 (parseUnifiedCsv 已經將 <br> 轉做換行)。
+ * @returns {Array<string>} 釋義 key 陣列。
+ */
+function normalizeMeaningKeys(meaningText) {
+  if (!meaningText) return [];
+  const keys = [];
+  meaningText.normalize('NFKC').split(/<br>|\n|[、,;。/]/).forEach(part => {
+    const key = part.replace(/^\d+\.\s*/, '').trim().replace(/^"+|"+$/g, '');
+    if (key && !keys.includes(key)) keys.push(key);
+  });
+  return keys;
+}
+
+/**
+ * 用 concordanceData (跨腔調詞彙對照索引) 尋讀音：
+ * 1. 完全符合个詞目直接用 byWord 查
+ * 2. 用完全符合詞目个華語詞義查 byMeaning，列出其他腔調、來源裡同義个詞目
+ * 3. 部分符合个詞目淨掃一擺 byWord 个 key
+ * 索引淨記 [來源, 編號]，詳細資料從載入時建好个 Map 查，毋使再解析資料表。
+ * @param {string} normalizedSearchText - 已經 trim 過个搜尋文字。
+ * @returns {Array<object>} 格式同 findPronunciationsInAllData 共樣。
+ */
+function findPronunciationsInConcordance(normalizedSearchText) {
+  const foundReadings = [];
+  const uniqueEntries = new Set();
+  const { sources, byWord, byMeaning } = concordanceData;
+  const exactMeanings = new Set();
+
+  const addEntries = (rowRefs, matchType) => {
+    for (const [sourceIndex, rowNumber] of rowRefs) {
+      if (foundReadings.length >= 50) return;
+      const dataVarName = sources[sourceIndex];
+      const line = getDataRowsByNumber(dataVarName).get(rowNumber);
+      if (!line || !line.客家語 || !line['客語標音_顯示']) continue;
+
+      const term = line.客家語.trim();
+      if (matchType === 'sameMeaning' && term === normalizedSearchText) continue;
+      const displayName = getPopupSourceName(dataVarName, line.sourceType);
+      const entryKey = `${line['客語標音_顯示']}|${displayName}|${term}`;
+      if (uniqueEntries.has(entryKey)) continue;
+
+      if (matchType === 'exact') {
+        normalizeMeaningKeys(line.華語詞義).forEach(key => exactMeanings.add(key));
+      }
+      foundReadings.push({
+        pronunciation: line['客語標音_顯示'],
+        source: displayName,
+        isExactMatch: matchType === 'exact',
+        isSameMeaning: matchType === 'sameMeaning',
+        originalTerm: term,
+        mandarinMeaning: line.華語詞義,
+        audioDetails: buildPopupAudioDetails(line, dataVarName, displayName)
+      });
+      uniqueEntries.add(entryKey);
+    }
+  };
+
+  if (Object.prototype.hasOwnProperty.call(byWord, normalizedSearchText)) {
+    addEntries(byWord[normalizedSearchText], 'exact');
+  }
+  if (byMeaning) {
+    exactMeanings.forEach(key => {
+      if (Object.prototype.hasOwnProperty.call(byMeaning, key)) addEntries(byMeaning[key], 'sameMeaning');
+    });
+  }
+  for (const term in byWord) {
+    if (foundReadings.length >= 50) break;
+    if (term !== normalizedSearchText && term.includes(normalizedSearchText)) {
+      addEntries(byWord[term], 'partial');
+    }
+  }
+
+  console.log(`Found ${foundReadings.length} readings for "${normalizedSearchText}" in concordance.`);
+  return foundReadings;
+}
+
 /**
  * 在所有已知的客語資料中搜尋指定文字的發音。
+ * 對照索引準備好个時節用索引；還吂準備好 (或尋無索引檔) 就退回逐隻資料表掃過。
  * @param {string} searchText - 要搜尋的文字。
  * @returns {Array<object>} 包含發音和來源的物件陣列。每個物件格式：{ pronunciation: string, source: string }
  */
@@ -4230,6 +4544,10 @@ function findPronunciationsInAllData(searchText) {
   }
   const normalizedSearchText = searchText.trim();
 
+  if (concordanceLoadState === 'loaded') {
+    return findPronunciationsInConcordance(normalizedSearchText);
+  }
+
   // --- FIX: 將 cert 和 gip 資料源合併，用單一迴圈處理統一格式 ---
   const allDataSourceVars = [...allKnownDataVars, ...allKnownGipDataVars];
 
@@ -4253,48 +4571,17 @@ function findPronunciationsInAllData(searchText) {
             const isPartial = !isExact && term.includes(normalizedSearchText);
 
             if (isExact || isPartial) {
-              // --- FIX: 修正 gip 資料个來源名稱，確保佢做得被腔調過濾器正確處理 ---
-              let displayName;
-              if (line.sourceType === 'cert') {
-                displayName = getFullLevelName(dataObject.name);
-              } else { // 處理 gip
-                const gipNameMap = { '教典四': '四縣教典', '教典海': '海陸教典', '教典大': '大埔教典', '教典平': '饒平教典', '教典安': '詔安教典', '教典南': '南四縣教典' };
-                displayName = gipNameMap[dataObject.name] || dataObject.name; // 若無對應到，用原名做 fallback
-              }
-
+              const displayName = getPopupSourceName(dataObject.name, line.sourceType);
               const entryKey = `${line['客語標音_顯示']}|${displayName}|${isExact ? 'exact' : 'partial'}|${term}`;
 
               if (!uniqueEntries.has(entryKey) && foundReadings.length < 50) {
-                let audioDetails = null;
-                // --- FIX: 根據 sourceType，用正確个變數 (dataObject.name) 來建立 audioDetails ---
-                if (line.sourceType === 'cert') {
-                  // 對 cert 資料，愛用 dataObject.name (例: '四基') 來分析腔調級別
-                  const 腔 = dataObject.name.substring(0, 1);
-                  const 級 = dataObject.name.substring(1);
-                  let selected例外音檔;
-                  switch (級) {
-                    case '基': selected例外音檔 = typeof 基例外音檔 !== 'undefined' ? 基例外音檔 : []; break;
-                    case '初': selected例外音檔 = typeof 初例外音檔 !== 'undefined' ? 初例外音檔 : []; break;
-                    case '中': selected例外音檔 = typeof 中例外音檔 !== 'undefined' ? 中例外音檔 : []; break;
-                    case '中高': selected例外音檔 = typeof 中高例外音檔 !== 'undefined' ? 中高例外音檔 : []; break;
-                    case '高': selected例外音檔 = typeof 高例外音檔 !== 'undefined' ? 高例外音檔 : []; break;
-                    default: selected例外音檔 = [];
-                  }
-                  let 檔腔 = '', 檔級 = '', 目錄級 = '', 目錄另級 = undefined;
-                  if (腔 === '四') { 檔腔 = 'si'; } else if (腔 === '海') { 檔腔 = 'ha'; } else if (腔 === '大') { 檔腔 = 'da'; } else if (腔 === '平') { 檔腔 = 'rh'; } else if (腔 === '安') { 檔腔 = 'zh'; }
-                  if (級 === '基') { 目錄級 = '5'; 目錄另級 = '1'; } else if (級 === '初') { 目錄級 = '1'; } else if (級 === '中') { 目錄級 = '2'; 檔級 = '1'; } else if (級 === '中高') { 目錄級 = '3'; 檔級 = '2'; } else if (級 === '高') { 目錄級 = '4'; 檔級 = '3'; }
-                  audioDetails = { lineData: { ...line }, dialectInfo: { 腔, 級, selected例外音檔, generalMediaYr: '112', 目錄級, 目錄另級, 檔腔, 檔級, fullLvlName: displayName } };
-                } else if (line.sourceType === 'gip') {
-                  audioDetails = { lineData: { ...line }, dialectInfo: { sourceType: 'gip' } };
-                }
-
                 foundReadings.push({
                   pronunciation: line['客語標音_顯示'],
                   source: displayName,
                   isExactMatch: isExact,
                   originalTerm: term,
                   mandarinMeaning: line.華語詞義, // Python 腳本已統一欄位
-                  audioDetails: audioDetails
+                  audioDetails: buildPopupAudioDetails(line, dataObject.name, displayName)
                 });
                 uniqueEntries.add(entryKey);
               }
@@ -4538,7 +4825,10 @@ function showPronunciationPopup(selectedText, readings, popupEl, contentEl, back
         const headerBtn = document.createElement('button');
         headerBtn.className = 'accordion-header';
         let headerText = `<span class="pronunciation-text">${reading.pronunciation}</span>`;
-        if (!reading.isExactMatch) {
+        if (reading.isSameMeaning) {
+          // 對照索引尋著个同義詞目 (例：醫院／病院)
+          headerText = `<span class="pronunciation-text">${reading.pronunciation} (同義: ${reading.originalTerm})</span>`;
+        } else if (!reading.isExactMatch) {
           // If not an exact match, show the original term it was found in
           headerText = `<span class="pronunciation-text">${reading.pronunciation} (詞目: ${reading.originalTerm})</span>`;
         }
@@ -4725,3 +5015,170 @@ function handleTextSelectionInSentence(event, popupEl, contentEl, backdropEl, ge
 }
 
 // --- 選詞發音 Popup 相關函式結束 ---
+
+// --- 拼音容錯查詢 (音節 BK-tree) 相關函式 ---
+
+// 學習者常用个其他拼音系統 (白話字等) 寫法 → 臺灣客家語拼音方案寫法；長个規則愛排頭前。
+// ch、j 在海陸、大埔、饒平、詔安係正經个聲母，毋好放入來。
+// 淨在查詢字个音節毋在音節表个時節正改寫 (見 extractQuerySyllables)。
+const ROMANISATION_CONFUSIONS = [
+  ['tsh', 'c'], ['ts', 'z'], ['ph', 'p'], ['th', 't'], ['kh', 'k'], ['ṳ', 'ii']
+];
+const syllableBkTreeCache = {}; // 用資料變數名組合做 key，暫存建好个 BK-tree
+
+/**
+ * 將標音字串拆做無聲調个音節 (同 process_all_data.py 整理音節表个做法共樣)。
+ * @param {string} text - 標音字串 (調號、數字調都做得)。
+ * @returns {Array<string>} 音節陣列。
+ */
+function extractCanonicalSyllables(text) {
+  if (!text) return [];
+  const result = text.toLowerCase().normalize('NFD').replace(/[\u0300-\u036f]/g, '');
+  return result.match(/[a-z]+/g) || [];
+}
+
+/**
+ * 將查詢字拆做音節。音節在音節表裡肚就照原樣；毋在正用 ROMANISATION_CONFUSIONS
+ * 將其他拼音系統个寫法改做客家語拼音方案 (例: tsii → zii、sṳ → sii)。
+ * @param {string} keyword - 查詢字。
+ * @param {Set<string>} inventory - 查詢範圍个音節表。
+ * @returns {Array<string>} 音節陣列。
+ */
+function extractQuerySyllables(keyword, inventory) {
+  const tokens = keyword.toLowerCase().normalize('NFC').match(/[\p{L}\p{M}]+/gu) || [];
+  return tokens.flatMap(token => {
+    // 淨拿忒調號；ṳ 个附加符號毋係調號，留等來就毋會當做拼音方案个音節
+    const plain = token.normalize('NFD').replace(/[\u0300-\u0304\u0306\u030c]/g, '');
+    if (/^[a-z]+$/.test(plain) && inventory.has(plain)) return [plain];
+    let rewritten = token;
+    ROMANISATION_CONFUSIONS.forEach(([variant, standard]) => {
+      rewritten = rewritten.split(variant).join(standard);
+    });
+    return extractCanonicalSyllables(rewritten);
+  });
+}
+
+/**
+ * 計算兩隻音節个編輯距離 (Levenshtein distance)。
+ */
+function syllableEditDistance(a, b) {
+  if (a === b) return 0;
+  let previousRow = Array.from({ length: b.length + 1 }, (_, j) => j);
+  for (let i = 1; i <= a.length; i++) {
+    const currentRow = [i];
+    for (let j = 1; j <= b.length; j++) {
+      const cost = a[i - 1] === b[j - 1] ? 0 : 1;
+      currentRow[j] = Math.min(previousRow[j] + 1, currentRow[j - 1] + 1, previousRow[j - 1] + cost);
+    }
+    previousRow = currentRow;
+  }
+  return previousRow[b.length];
+}
+
+/**
+ * 用音節表建立 BK-tree。逐隻節點个格式：{ syllable: string, children: { [距離]: 節點 } }
+ * @param {Iterable<string>} syllables - 音節表。
+ * @returns {object|null} BK-tree 个根節點。
+ */
+function buildSyllableBkTree(syllables) {
+  let root = null;
+  for (const syllable of syllables) {
+    if (!root) {
+      root = { syllable, children: {} };
+      continue;
+    }
+    let node = root;
+    for (;;) {
+      const distance = syllableEditDistance(syllable, node.syllable);
+      if (distance === 0) break;
+      if (!node.children[distance]) {
+        node.children[distance] = { syllable, children: {} };
+        break;
+      }
+      node = node.children[distance];
+    }
+  }
+  return root;
+}
+
+/**
+ * 在 BK-tree 裡肚尋編輯距離在 maxDistance 以內个音節。
+ * @returns {Map<string, number>} 音節 → 距離。
+ */
+function searchSyllableBkTree(root, syllable, maxDistance) {
+  const found = new Map();
+  const stack = root ? [root] : [];
+  while (stack.length > 0) {
+    const node = stack.pop();
+    const distance = syllableEditDistance(syllable, node.syllable);
+    if (distance <= maxDistance) found.set(node.syllable, distance);
+    for (let d = Math.max(1, distance - maxDistance); d <= distance + maxDistance; d++) {
+      if (node.children[d]) stack.push(node.children[d]);
+    }
+  }
+  return found;
+}
+
+/**
+ * 取得查詢範圍 (逐隻資料變數) 个音節 BK-tree。
+ * 優先用 process_all_data.py 產生个 syllableIndexData，無就從 rows 个「客語標音_查詢」即時整理。
+ * @param {Array<string>} sourceNames - 資料變數名 (例: ['四基', ..., '教典四'])。
+ * @param {Array<object>} rows - 查詢範圍个資料。
+ * @returns {{tree: object|null, inventory: Set<string>}} BK-tree 个根節點同音節表。
+ */
+function getSyllableBkTree(sourceNames, rows) {
+  const cacheKey = sourceNames.join('|');
+  if (syllableBkTreeCache[cacheKey] !== undefined) return syllableBkTreeCache[cacheKey];
+
+  const inventory = new Set();
+  const indexedSyllables = typeof syllableIndexData !== 'undefined' ? syllableIndexData.syllables : null;
+  if (indexedSyllables && sourceNames.every(name => indexedSyllables[name])) {
+    sourceNames.forEach(name => indexedSyllables[name].forEach(s => inventory.add(s)));
+  } else {
+    rows.forEach(row => extractCanonicalSyllables(row['客語標音_查詢']).forEach(s => inventory.add(s)));
+  }
+
+  syllableBkTreeCache[cacheKey] = { tree: buildSyllableBkTree(inventory), inventory };
+  return syllableBkTreeCache[cacheKey];
+}
+
+/**
+ * 建立拼音容錯比對函式。查詢字逐隻音節先用 BK-tree 尋出相近个音節，
+ * 比對時淨愛檢查詞條音節有無連續落在候選裡肚，毋使同逐隻詞條算編輯距離。
+ * 逐隻音節容許个距離最多係音節長度个三分之一，避免短音節配著忒多無關个結果。
+ * maxDistance 係 0 (毋容錯) 也照樣建立，拼音系統个改寫 (例: tsii → zii) 還係有效。
+ * @param {string} keyword - 查詢字。
+ * @param {Array<string>} sourceNames - 資料變數名。
+ * @param {Array<object>} rows - 查詢範圍个資料。
+ * @param {number} maxDistance - 全部音節加起來容許个編輯距離。
+ * @returns {Function|null} (標音字串) => 最細距離，配毋著就回傳 -1；查詢字無音節就回傳 null。
+ */
+function createPhoneticTypoMatcher(keyword, sourceNames, rows, maxDistance) {
+  const { tree, inventory } = getSyllableBkTree(sourceNames, rows);
+  const querySyllables = extractQuerySyllables(keyword, inventory);
+  if (querySyllables.length === 0) return null;
+  maxDistance = Math.max(0, maxDistance);
+
+  const candidates = querySyllables.map(syllable =>
+    searchSyllableBkTree(tree, syllable, Math.min(maxDistance, Math.floor(syllable.length / 3)))
+  );
+
+  return (phoneticText) => {
+    const rowSyllables = extractCanonicalSyllables(phoneticText);
+    let best = -1;
+    for (let start = 0; start + candidates.length <= rowSyllables.length; start++) {
+      let total = 0;
+      for (let i = 0; i < candidates.length && total <= maxDistance; i++) {
+        const distance = candidates[i].get(rowSyllables[start + i]);
+        total = distance === undefined ? Infinity : total + distance;
+      }
+      if (total <= maxDistance && (best === -1 || total < best)) {
+        best = total;
+        if (best === 0) break;
+      }
+    }
+    return best;
+  };
+}
+
+// --- 拼音容錯查詢相關函式結束 ---
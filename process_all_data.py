@@ -301,17 +301,79 @@ def generate_js_from_json(json_path, js_path):
     except Exception as e:
         print(f"✗ 產生 JS 檔案時發生錯誤: {e}")
 
+# --- Concordance Functions ---
+
+def normalize_meaning_keys(meaning_text):
+    """將華語詞義切做一條一條个釋義，做詞義索引个 key。前端个 normalizeMeaningKeys 愛同這共樣。"""
+    if not meaning_text: return []
+    text = unicodedata.normalize('NFKC', meaning_text)
+    keys = []
+    for part in re.split(r'<br>|\n|[、,;。/]', text):
+        part = re.sub(r'^\d+\.\s*', '', part).strip().strip('"')
+        if part and part not in keys:
+            keys.append(part)
+    return keys
+
+def build_concordance(parsed_sources):
+    """
+    將所有腔調、級別、教典个資料合併做一隻對照索引，逐筆淨記位置 [sources 个索引, 編號]：
+    byWord 用「客家語」做 key；byMeaning 用正規化後个「華語詞義」做 key。
+    詳細資料 (標音、詞義、音檔) 由前端從已經載入个資料表查。
+    """
+    sources, by_word, by_meaning = [], {}, {}
+    for variable_name, _, rows in parsed_sources:
+        source_index = len(sources)
+        sources.append(variable_name)
+        for row in rows:
+            term = row.get('客家語', '').strip()
+            if not term or not row.get('客語標音_顯示'):
+                continue
+            row_ref = [source_index, row.get('編號', '')]
+            by_word.setdefault(term, []).append(row_ref)
+            for key in normalize_meaning_keys(row.get('華語詞義', '')):
+                by_meaning.setdefault(key, {}).setdefault(term, []).append(row_ref)
+    # 詞義索引係分「同義个其他詞目」用个，淨有一隻詞目个釋義 (多數係教典个長句) 就毋使記
+    by_meaning = {
+        key: [row_ref for refs in terms.values() for row_ref in refs]
+        for key, terms in by_meaning.items() if len(terms) > 1
+    }
+    return {'sources': sources, 'byWord': by_word, 'byMeaning': by_meaning}
+
+def build_syllable_inventory(parsed_sources):
+    """由「客語標音_查詢」拿忒聲調，整理出逐隻資料來源个音節表。其他拼音系統个改寫淨在前端 (main.js 个 ROMANISATION_CONFUSIONS) 做。"""
+    inventory = {}
+    for variable_name, _, rows in parsed_sources:
+        syllables = set()
+        for row in rows:
+            phonetic = unicodedata.normalize('NFD', row.get('客語標音_查詢', '').lower())
+            phonetic = re.sub(r'[\u0300-\u036f]', '', phonetic)
+            syllables.update(re.findall(r'[a-z]+', phonetic))
+        inventory[variable_name] = sorted(syllables)
+    return {'syllables': inventory}
+
+def write_syllable_index_js(syllable_index, output_path):
+    json_content = json.dumps(syllable_index, ensure_ascii=False, separators=(',', ':'))
+    with open(output_path, 'w', encoding='utf-8') as f:
+        f.write(f"const syllableIndexData = {json_content};\n")
+
+def write_concordance_js(concordance, output_path):
+    json_content = json.dumps(concordance, ensure_ascii=False, separators=(',', ':'))
+    with open(output_path, 'w', encoding='utf-8') as f:
+        f.write(f"const concordanceData = {json_content};\n")
+
 # --- Main Processing Logic ---
 
 def process_directory(directory_path, source_type, all_maps):
+    """處理目錄下所有 CSV，並回傳 (JS 變數名, 來源類型, 資料) 个列表，分對照索引用。"""
+    parsed_sources = []
     print(f"--- 開始處理目錄：{directory_path} ({source_type}) ---")
     if not os.path.isdir(directory_path):
         print(f"  ✗ 錯誤：尋無目錄 '{directory_path}'。")
-        return
+        return parsed_sources
     csv_files = [f for f in os.listdir(directory_path) if f.endswith('.csv')]
     if not csv_files:
         print("  - 在該目錄下尋無任何 .csv 檔案。")
-        return
+        return parsed_sources
     for filename in csv_files:
         file_path = os.path.join(directory_path, filename)
         print(f"\n> 處理中: {file_path}")
@@ -319,6 +381,7 @@ def process_directory(directory_path, source_type, all_maps):
             parsed_data, output_js_path, js_variable_name = None, None, None
             if source_type == 'cert':
                 output_js_path = os.path.splitext(file_path)[0] + '.js'
+                js_variable_name = get_js_variable_name(filename, source_type)
                 parsed_data = parse_cert_csv(file_path, all_maps['expanded_reverse_map'], all_maps['vowel_map'], all_maps['vowel_priority'])
             elif source_type == 'gip':
                 match = re.search(r'(\d+)-(.+)\.csv', filename)
@@ -334,8 +397,10 @@ def process_directory(directory_path, source_type, all_maps):
                 continue
             write_to_js_file(parsed_data, output_js_path, source_type, variable_name=js_variable_name)
             print(f"  ✓ 成功產生檔案: {output_js_path}")
+            parsed_sources.append((js_variable_name, source_type, parsed_data))
         except Exception as e:
             print(f"  ✗ 錯誤：處理檔案 {filename} 時發生意外：{e}")
+    return parsed_sources
 
 if __name__ == '__main__':
     script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -360,9 +425,28 @@ if __name__ == '__main__':
         'gip': os.path.join(script_dir, 'data', 'gip')
     }
 
+    all_parsed_sources = []
     for source_type, source_path in source_map.items():
-        process_directory(source_path, source_type, all_maps)
+        all_parsed_sources.extend(process_directory(source_path, source_type, all_maps))
         
     print("\n--- 全部 CSV 處理完成 ---")
 
+    print("\n--- 開始產生跨腔調詞彙對照索引 ---")
+    concordance_path = os.path.join(script_dir, 'data', 'concordance.js')
+    try:
+        concordance = build_concordance(all_parsed_sources)
+        write_concordance_js(concordance, concordance_path)
+        print(f"✓ 已成功產生檔案: {concordance_path}（{len(concordance['byWord'])} 隻詞目）")
+    except Exception as e:
+        print(f"✗ 產生對照索引時發生錯誤: {e}")
+
+    print("\n--- 開始產生拼音容錯查詢用个音節表 ---")
+    syllable_index_path = os.path.join(script_dir, 'data', 'syllable_index.js')
+    try:
+        syllable_index = build_syllable_inventory(all_parsed_sources)
+        write_syllable_index_js(syllable_index, syllable_index_path)
+        print(f"✓ 已成功產生檔案: {syllable_index_path}")
+    except Exception as e:
+        print(f"✗ 產生音節表時發生錯誤: {e}")
+
     generate_js_from_json(os.path.join(script_dir, 'tone_mapping.json'), os.path.join(script_dir, 'tone_mapping_data.js'))
\ No newline at end of file